@@ -8,43 +8,52 @@ an API endpoint for LLM interactions.
 """
 
 import os
+import re
+import time
+import asyncio
+import functools
+import string
 import json
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import importlib.util
+from abc import ABC, abstractmethod
+from collections import ChainMap
+from dataclasses import dataclass
+from types import CodeType
+from typing import AsyncIterator, Dict, List, Optional, Any
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
-from datetime import datetime
-import backoff
+from datetime import datetime, timezone
 import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
 
-# Import LLM providers
+# Import LLM providers (Anthropic and Gemini SDKs are imported only when configured)
 import openai
-from anthropic import Anthropic
-import google.generativeai as genai
 
 # Configure structured logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Import LangGraph components (optional)
-try:
-    from langgraph.graph import StateGraph, END
-    from langgraph.prebuilt import create_react_agent
-    from langchain_openai import ChatOpenAI
-    from langchain_anthropic import ChatAnthropic
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain.schema import HumanMessage, SystemMessage
-    from langchain.tools import BaseTool
-    from typing import Type
-    LANGGRAPH_AVAILABLE = True
-    logger.info("LangGraph dependencies loaded successfully")
-except ImportError as e:
-    LANGGRAPH_AVAILABLE = False
-    logger.warning(f"LangGraph dependencies not available: {e}")
+# LangGraph components are optional and imported only when the langgraph framework is used
+LANGGRAPH_MODULES = ("langgraph", "langchain", "langchain_openai", "langchain_anthropic", "langchain_google_genai")
+LANGGRAPH_AVAILABLE = all(importlib.util.find_spec(module) is not None for module in LANGGRAPH_MODULES)
+if not LANGGRAPH_AVAILABLE:
+    logger.warning("LangGraph dependencies not available")
     logger.warning("Agent will only support direct framework mode")
 
-app = FastAPI(title="KubeAgentic Agent", version="1.0.0")
+app = FastAPI(title="KubeAgentic Agent", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Shared HTTP client so OpenAI and vLLM calls reuse pooled keep-alive connections
+HTTPX_CLIENT = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=256, max_keepalive_connections=128, keepalive_expiry=30),
+    timeout=httpx.Timeout(60, connect=5),
+    http2=True
+)
 
 # --- Pydantic Models for API Requests and Responses ---
 
@@ -53,6 +62,7 @@ class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
     context: Optional[Dict[str, Any]] = None
+    stream: bool = False
 
 class ChatResponse(BaseModel):
     """Response model for the /chat endpoint."""
@@ -71,24 +81,40 @@ class HealthResponse(BaseModel):
 
 # --- Agent Configuration ---
 
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
-    """Loads and holds the agent's configuration from environment variables."""
-    def __init__(self):
-        self.provider = os.getenv("AGENT_PROVIDER", "openai")
-        self.model = os.getenv("AGENT_MODEL", "gpt-3.5-turbo")
-        self.system_prompt = os.getenv("AGENT_SYSTEM_PROMPT", "You are a helpful AI assistant.")
-        self.api_key = os.getenv("AGENT_API_KEY")
-        self.endpoint = os.getenv("AGENT_ENDPOINT")
-        self.framework = os.getenv("AGENT_FRAMEWORK", "direct")
-        self.tools_count = int(os.getenv("AGENT_TOOLS_COUNT", "0"))
+    """Immutable agent configuration, loaded from environment variables via from_env()."""
+    provider: str
+    model: str
+    system_prompt: str
+    api_key: str
+    endpoint: Optional[str]
+    framework: str
+    tools_count: int
+    cache_maxsize: int
+    cache_ttl: int
+    session_backend: str
+    session_ttl: int
+    redis_url: str
+    langgraph_config: Optional[Dict[str, Any]]
+
+    @classmethod
+    @functools.cache
+    def from_env(cls) -> "AgentConfig":
+        """Reads, parses and validates the agent configuration. Runs at most once per process."""
+        provider = os.getenv("AGENT_PROVIDER", "openai")
+        model = os.getenv("AGENT_MODEL", "gpt-3.5-turbo")
+        api_key = os.getenv("AGENT_API_KEY")
+        framework = os.getenv("AGENT_FRAMEWORK", "direct")
+        session_backend = os.getenv("AGENT_SESSION_BACKEND", "memory")
         
         # Load LangGraph configuration if framework is langgraph
-        self.langgraph_config = None
-        if self.framework == "langgraph":
+        langgraph_config = None
+        if framework == "langgraph":
             langgraph_config_str = os.getenv("AGENT_LANGGRAPH_CONFIG")
             if langgraph_config_str:
                 try:
-                    self.langgraph_config = json.loads(langgraph_config_str)
+                    langgraph_config = json.loads(langgraph_config_str)
                     logger.info("LangGraph configuration loaded")
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid LangGraph configuration JSON: {e}")
@@ -96,57 +122,189 @@ class AgentConfig:
             else:
                 logger.warning("Framework set to 'langgraph' but no AGENT_LANGGRAPH_CONFIG provided")
         
-        if not self.api_key:
+        if not api_key:
             logger.error("AGENT_API_KEY environment variable is not set.")
             raise ValueError("AGENT_API_KEY environment variable is required")
         
         # Validate framework
-        if self.framework not in ["direct", "langgraph"]:
-            logger.error(f"Invalid framework: {self.framework}")
-            raise ValueError(f"Framework must be 'direct' or 'langgraph', got: {self.framework}")
+        if framework not in ["direct", "langgraph"]:
+            logger.error(f"Invalid framework: {framework}")
+            raise ValueError(f"Framework must be 'direct' or 'langgraph', got: {framework}")
+        
+        # Validate session backend
+        if session_backend not in ["memory", "redis"]:
+            logger.error(f"Invalid session backend: {session_backend}")
+            raise ValueError(f"Session backend must be 'memory' or 'redis', got: {session_backend}")
         
         # Check LangGraph availability if needed
-        if self.framework == "langgraph" and not LANGGRAPH_AVAILABLE:
+        if framework == "langgraph" and not LANGGRAPH_AVAILABLE:
             logger.error("Framework set to 'langgraph' but LangGraph dependencies not available")
             raise ValueError("LangGraph dependencies required for 'langgraph' framework")
         
-        logger.info(f"Agent configured with provider: {self.provider}, model: {self.model}, framework: {self.framework}")
+        logger.info(f"Agent configured with provider: {provider}, model: {model}, framework: {framework}")
+        
+        return cls(
+            provider=provider,
+            model=model,
+            system_prompt=os.getenv("AGENT_SYSTEM_PROMPT", "You are a helpful AI assistant."),
+            api_key=api_key,
+            endpoint=os.getenv("AGENT_ENDPOINT"),
+            framework=framework,
+            tools_count=int(os.getenv("AGENT_TOOLS_COUNT", "0")),
+            cache_maxsize=int(os.getenv("AGENT_CACHE_MAXSIZE", "1000")),
+            cache_ttl=int(os.getenv("AGENT_CACHE_TTL", "86400")),
+            session_backend=session_backend,
+            session_ttl=int(os.getenv("AGENT_SESSION_TTL", "86400")),
+            redis_url=os.getenv("AGENT_REDIS_URL", "redis://localhost:6379/0"),
+            langgraph_config=langgraph_config
+        )
+
+# --- Response Cache ---
+
+class ResponseCache:
+    """Exact-match cache for LLM responses, keyed on provider, model, system prompt and message."""
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.enabled = maxsize > 0 and ttl > 0
+        self._cache = TTLCache(maxsize=max(maxsize, 1), ttl=max(ttl, 1))
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def make_key(cls, provider: str, model: str, system_prompt: str, message: str) -> str:
+        """Builds the cache key; the message is lowercased and its whitespace collapsed."""
+        normalized_message = cls._WHITESPACE.sub(" ", message.strip().lower())
+        raw = f"{provider}:{model}:{system_prompt}:{normalized_message}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        response = self._cache.get(key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def set(self, key: str, response: str):
+        # Empty responses (e.g. a stream that produced no text) are never worth replaying
+        if self.enabled and response:
+            self._cache[key] = response
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._cache),
+            "maxsize": int(self._cache.maxsize),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
 
 # --- LLM Provider Logic ---
 
+# Errors worth retrying for every provider; SDK-specific errors are added per provider in _initialize_client
+TRANSIENT_ERRORS = (httpx.RequestError,)
+# Request timeouts and lock conflicts reported by the provider; like the SDKs, every 5xx is retried too
+RETRYABLE_STATUS_CODES = frozenset({408, 409})
+
 class LLMProvider:
     """Handles the interaction with the underlying LLM provider."""
     def __init__(self, config: AgentConfig):
         self.config = config
         self.client = None
+        self.cache = ResponseCache(config.cache_maxsize, config.cache_ttl)
+        # Hosted OpenAI keeps conversation history server-side, so each turn only sends the new message
+        self.chains_responses = config.provider == "openai" and not config.endpoint
+        self._last_response_id = LRUCache(maxsize=10_000)
+        # Marked as a cacheable prefix so Anthropic skips re-processing the system prompt on every request
+        self._claude_system = [
+            {"type": "text", "text": config.system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+        # The system prompt is fixed for the pod's lifetime, so the Gemini prompt prefix is built once
+        self._gemini_prefix = f"System: {config.system_prompt}\n\nUser: "
         self._initialize_client()
     
     def _initialize_client(self):
-        """Initializes the appropriate LLM client based on the configured provider."""
+        """
+        Initializes the appropriate async LLM client based on the configured provider.
+        SDK-level retries are disabled because _retrying owns the retry policy, so each
+        provider registers the SDK errors that policy should retry.
+        """
         try:
             if self.config.provider == "openai":
-                self.client = openai.OpenAI(
+                self.client = openai.AsyncOpenAI(
+                    api_key=self.config.api_key,
+                    base_url=self.config.endpoint,
+                    http_client=HTTPX_CLIENT,
+                    max_retries=0
+                ) if self.config.endpoint else openai.AsyncOpenAI(
                     api_key=self.config.api_key,
-                    base_url=self.config.endpoint
-                ) if self.config.endpoint else openai.OpenAI(api_key=self.config.api_key)
+                    http_client=HTTPX_CLIENT,
+                    max_retries=0
+                )
+                # The OpenAI SDK wraps httpx failures in APIConnectionError
+                self._transient_errors = TRANSIENT_ERRORS + (openai.APIConnectionError, openai.RateLimitError)
+                self._status_errors = (openai.APIStatusError,)
             
             elif self.config.provider == "claude":
-                self.client = Anthropic(api_key=self.config.api_key)
+                import anthropic
+                from anthropic import AsyncAnthropic
+                # Recent SDKs reject httpx clients, so Claude gets its own pool built from the SDK's types
+                limits = type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+                    max_connections=256, max_keepalive_connections=128, keepalive_expiry=30
+                )
+                http_client = anthropic.DefaultAsyncHttpxClient(
+                    limits=limits, timeout=anthropic.Timeout(60, connect=5), http2=True
+                )
+                self.client = AsyncAnthropic(api_key=self.config.api_key, http_client=http_client, max_retries=0)
+                self._transient_errors = TRANSIENT_ERRORS + (anthropic.APIConnectionError, anthropic.RateLimitError)
+                self._status_errors = (anthropic.APIStatusError,)
             
             elif self.config.provider == "gemini":
+                import google.generativeai as genai
+                from google.api_core import exceptions as google_exceptions
                 genai.configure(api_key=self.config.api_key)
                 self.client = genai.GenerativeModel(self.config.model)
+                # The Gemini SDK goes through google-api-core, which raises its own exception types
+                self._transient_errors = TRANSIENT_ERRORS + (
+                    google_exceptions.ResourceExhausted,
+                    google_exceptions.ServiceUnavailable,
+                    google_exceptions.InternalServerError,
+                    google_exceptions.DeadlineExceeded
+                )
+                self._status_errors = ()
             
             elif self.config.provider == "vllm":
                 if not self.config.endpoint:
                     raise ValueError("Endpoint is required for the vLLM provider")
-                self.client = openai.OpenAI(
+                self.client = openai.AsyncOpenAI(
                     api_key=self.config.api_key,
-                    base_url=self.config.endpoint
+                    base_url=self.config.endpoint,
+                    http_client=HTTPX_CLIENT,
+                    max_retries=0
                 )
+                self._transient_errors = TRANSIENT_ERRORS + (openai.APIConnectionError, openai.RateLimitError)
+                self._status_errors = (openai.APIStatusError,)
             
             else:
                 raise ValueError(f"Unsupported provider: {self.config.provider}")
+            
+            self._dispatch = {
+                "openai": self._chat_openai_like,
+                "vllm": self._chat_openai_like,
+                "claude": self._chat_claude,
+                "gemini": self._chat_gemini
+            }
+            self._stream_dispatch = {
+                "openai": self._stream_openai_like,
+                "vllm": self._stream_openai_like,
+                "claude": self._stream_claude,
+                "gemini": self._stream_gemini
+            }
                 
             logger.info(f"Successfully initialized client for provider: {self.config.provider}")
             
@@ -154,46 +312,257 @@ class LLMProvider:
             logger.error(f"Failed to initialize LLM client: {e}", exc_info=True)
             raise
 
-    @backoff.on_exception(backoff.expo, (httpx.RequestError, openai.RateLimitError), max_tries=3)
+    async def close(self):
+        """Closes the Claude client's own connection pool; the other providers use HTTPX_CLIENT."""
+        if self.config.provider == "claude":
+            await self.client.close()
+
     async def chat(self, message: str, conversation_id: Optional[str] = None) -> str:
         """
         Sends a chat message to the LLM and returns the response.
-        Includes retry logic for transient network errors and rate limiting.
+        Identical prompts are answered from the response cache without calling the provider.
+        Turns of a chained OpenAI conversation depend on its history and always go to the provider.
+        """
+        if conversation_id and self.chains_responses:
+            return await self._complete(message, conversation_id)
+        
+        key = ResponseCache.make_key(self.config.provider, self.config.model, self.config.system_prompt, message)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response = await self._complete(message)
+        self.cache.set(key, response)
+        return response
+
+    async def stream(self, message: str, conversation_id: Optional[str] = None) -> AsyncIterator[str]:
         """
+        Streams the LLM response as text chunks as they are generated.
+        Cached responses are replayed as a single chunk, and completed streams are stored in the cache.
+        """
+        key = None
+        if not (conversation_id and self.chains_responses):
+            key = ResponseCache.make_key(self.config.provider, self.config.model, self.config.system_prompt, message)
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        # Opening the stream is retried like a completion; once a chunk has been sent it is not
+        chunks = []
         try:
-            if self.config.provider in ["openai", "vllm"]:
-                response = self.client.chat.completions.create(
-                    model=self.config.model,
-                    messages=[
-                        {"role": "system", "content": self.config.system_prompt},
-                        {"role": "user", "content": message}
-                    ],
-                    temperature=0.7,
-                    max_tokens=2000
-                )
-                return response.choices[0].message.content
-            
-            elif self.config.provider == "claude":
-                response = self.client.messages.create(
-                    model=self.config.model,
-                    max_tokens=2000,
-                    system=self.config.system_prompt,
-                    messages=[{"role": "user", "content": message}]
-                )
-                return response.content[0].text
-            
-            elif self.config.provider == "gemini":
-                full_prompt = f"System: {self.config.system_prompt}\n\nUser: {message}"
-                response = self.client.generate_content(full_prompt)
-                return response.text
-                
-        except (httpx.RequestError, openai.RateLimitError) as e:
-            logger.warning(f"A transient error occurred: {e}. Retrying...")
+            async for attempt in self._retrying():
+                with attempt:
+                    source = self._stream_dispatch[self.config.provider](message, conversation_id)
+                    first = await anext(source, None)
+        except Exception as e:
+            if self._is_transient(e):
+                logger.error(f"LLM stream failed after retries: {e}")
             raise
+        
+        if first is not None:
+            chunks.append(first)
+            yield first
+            async for chunk in source:
+                chunks.append(chunk)
+                yield chunk
+        
+        if key is not None:
+            self.cache.set(key, "".join(chunks))
+
+    def _is_transient(self, error: BaseException) -> bool:
+        """Returns whether an upstream error is worth retrying for the configured provider."""
+        if isinstance(error, self._transient_errors):
+            return True
+        if isinstance(error, self._status_errors):
+            return error.status_code >= 500 or error.status_code in RETRYABLE_STATUS_CODES
+        return False
+
+    def _retrying(self) -> AsyncRetrying:
+        """Builds the retry policy shared by completions and stream openings."""
+        return AsyncRetrying(
+            retry=retry_if_exception(self._is_transient),
+            wait=wait_random_exponential(multiplier=0.5, max=10),
+            stop=stop_after_attempt(3),
+            before_sleep=lambda state: logger.warning(
+                f"A transient error occurred: {state.outcome.exception()}. Retrying..."
+            ),
+            reraise=True
+        )
+
+    async def _complete(self, message: str, conversation_id: Optional[str] = None) -> str:
+        """
+        Sends a message to the upstream LLM provider.
+        Includes retry logic with jittered exponential backoff for transient network errors,
+        rate limiting, server errors and request timeouts.
+        """
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    return await self._dispatch[self.config.provider](message, conversation_id)
         except Exception as e:
+            if self._is_transient(e):
+                logger.error(f"LLM request failed after retries: {e}")
+                raise
             logger.error(f"An unexpected error occurred in chat completion: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"LLM request failed: {str(e)}")
 
+    async def _chat_openai_like(self, message: str, conversation_id: Optional[str]) -> str:
+        """Chat Completions call for OpenAI and OpenAI-compatible (vLLM) endpoints."""
+        if conversation_id and self.chains_responses:
+            return await self._chat_openai_responses(message, conversation_id)
+        
+        response = await self.client.chat.completions.create(
+            model=self.config.model,
+            messages=[
+                {"role": "system", "content": self.config.system_prompt},
+                {"role": "user", "content": message}
+            ],
+            temperature=0.7,
+            max_tokens=2000
+        )
+        return response.choices[0].message.content
+
+    async def _chat_openai_responses(self, message: str, conversation_id: str) -> str:
+        """Responses API call chained onto the conversation's previous response."""
+        response = await self.client.responses.create(
+            model=self.config.model,
+            instructions=self.config.system_prompt,
+            input=message,
+            previous_response_id=self._last_response_id.get(conversation_id),
+            temperature=0.7,
+            max_output_tokens=2000
+        )
+        self._last_response_id[conversation_id] = response.id
+        return response.output_text
+
+    async def _chat_claude(self, message: str, conversation_id: Optional[str]) -> str:
+        """Messages API call for Anthropic Claude."""
+        response = await self.client.messages.create(
+            model=self.config.model,
+            max_tokens=2000,
+            system=self._claude_system,
+            messages=[{"role": "user", "content": message}]
+        )
+        return response.content[0].text
+
+    async def _chat_gemini(self, message: str, conversation_id: Optional[str]) -> str:
+        """Content generation call for Google Gemini."""
+        response = await self.client.generate_content_async(self._gemini_prefix + message)
+        return response.text
+
+    async def _stream_openai_like(self, message: str, conversation_id: Optional[str]) -> AsyncIterator[str]:
+        """Streaming Chat Completions call for OpenAI and OpenAI-compatible (vLLM) endpoints."""
+        if conversation_id and self.chains_responses:
+            async for chunk in self._stream_openai_responses(message, conversation_id):
+                yield chunk
+            return
+        
+        stream = await self.client.chat.completions.create(
+            model=self.config.model,
+            messages=[
+                {"role": "system", "content": self.config.system_prompt},
+                {"role": "user", "content": message}
+            ],
+            temperature=0.7,
+            max_tokens=2000,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_openai_responses(self, message: str, conversation_id: str) -> AsyncIterator[str]:
+        """Streaming Responses API call chained onto the conversation's previous response."""
+        stream = await self.client.responses.create(
+            model=self.config.model,
+            instructions=self.config.system_prompt,
+            input=message,
+            previous_response_id=self._last_response_id.get(conversation_id),
+            temperature=0.7,
+            max_output_tokens=2000,
+            stream=True
+        )
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                yield event.delta
+            elif event.type == "response.completed":
+                self._last_response_id[conversation_id] = event.response.id
+
+    async def _stream_claude(self, message: str, conversation_id: Optional[str]) -> AsyncIterator[str]:
+        """Streaming Messages API call for Anthropic Claude."""
+        async with self.client.messages.stream(
+            model=self.config.model,
+            max_tokens=2000,
+            system=self._claude_system,
+            messages=[{"role": "user", "content": message}]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    async def _stream_gemini(self, message: str, conversation_id: Optional[str]) -> AsyncIterator[str]:
+        """Streaming content generation call for Google Gemini."""
+        response = await self.client.generate_content_async(self._gemini_prefix + message, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+# --- Conversation Session Storage ---
+
+class SessionStore(ABC):
+    """Stores LangGraph conversation state keyed by conversation id."""
+
+    @abstractmethod
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored state for a conversation, or None if there is none."""
+
+    @abstractmethod
+    async def set(self, conversation_id: str, state: Dict[str, Any]):
+        """Stores the state for a conversation."""
+
+    async def close(self):
+        """Releases any resources held by the store."""
+
+class InMemoryStore(SessionStore):
+    """Process-local session store, bounded by LRU eviction. Intended for development and single replicas."""
+    def __init__(self, maxsize: int = 10_000):
+        self._sessions = LRUCache(maxsize=maxsize)
+
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        return self._sessions.get(conversation_id)
+
+    async def set(self, conversation_id: str, state: Dict[str, Any]):
+        self._sessions[conversation_id] = state
+
+class RedisStore(SessionStore):
+    """Redis-backed session store shared by all replicas and persisted across pod restarts."""
+    def __init__(self, url: str, ttl: int):
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = ttl
+
+    @staticmethod
+    def _key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}"
+
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self._key(conversation_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, conversation_id: str, state: Dict[str, Any]):
+        await self._redis.setex(self._key(conversation_id), self._ttl, json.dumps(state, default=str))
+
+    async def close(self):
+        await self._redis.aclose()
+
+def create_session_store(config: AgentConfig) -> SessionStore:
+    """Creates the session store selected by AGENT_SESSION_BACKEND."""
+    if config.session_backend == "redis":
+        logger.info("Using Redis session store")
+        return RedisStore(config.redis_url, config.session_ttl)
+    return InMemoryStore()
+
 # --- LangGraph Provider ---
 
 class LangGraphProvider:
@@ -205,7 +574,12 @@ class LangGraphProvider:
         self.config = config
         self.llm = None
         self.workflow = None
-        self.sessions = {}  # Simple in-memory session storage
+        self.store = create_session_store(config)
+        self._node_builders = {
+            "llm": self._create_llm_node,
+            "tool": self._create_tool_node
+        }
+        self._compiled_conditions: Dict[str, CodeType] = {}
         self._initialize_llm()
         if config.langgraph_config:
             self._build_workflow()
@@ -213,17 +587,20 @@ class LangGraphProvider:
     def _initialize_llm(self):
         """Initialize the appropriate LangChain LLM."""
         if self.config.provider == "openai":
+            from langchain_openai import ChatOpenAI
             self.llm = ChatOpenAI(
                 model=self.config.model,
                 openai_api_key=self.config.api_key,
                 base_url=self.config.endpoint
             )
         elif self.config.provider == "claude":
+            from langchain_anthropic import ChatAnthropic
             self.llm = ChatAnthropic(
                 model=self.config.model,
                 anthropic_api_key=self.config.api_key
             )
         elif self.config.provider == "gemini":
+            from langchain_google_genai import ChatGoogleGenerativeAI
             self.llm = ChatGoogleGenerativeAI(
                 model=self.config.model,
                 google_api_key=self.config.api_key
@@ -239,17 +616,19 @@ class LangGraphProvider:
         
         # Add nodes
         for node in self.config.langgraph_config.get("nodes", []):
-            if node["type"] == "llm":
-                workflow.add_node(node["name"], self._create_llm_node(node))
-            elif node["type"] == "tool":
-                workflow.add_node(node["name"], self._create_tool_node(node))
+            builder = self._node_builders.get(node["type"])
+            if builder is None:
+                logger.warning(f"Skipping node {node['name']} with unsupported type: {node['type']}")
+                continue
+            workflow.add_node(node["name"], builder(node))
         
         # Add edges
         for edge in self.config.langgraph_config.get("edges", []):
             if edge.get("condition"):
+                code = self._compile_condition(edge)
                 workflow.add_conditional_edges(
                     edge["from"],
-                    lambda state, e=edge: edge["to"] if self._evaluate_condition(e["condition"], state) else END
+                    lambda state, to=edge["to"], code=code: to if self._evaluate_condition(code, state) else END
                 )
             else:
                 workflow.add_edge(edge["from"], edge["to"])
@@ -261,13 +640,38 @@ class LangGraphProvider:
         self.workflow = workflow.compile()
         logger.info("LangGraph workflow compiled successfully")
     
+    @staticmethod
+    def _compile_template(prompt: str):
+        """
+        Parse a prompt template once into a renderer equivalent to prompt.format(**state).
+        Templates using conversions, format specs or attribute/index lookups keep using str.format.
+        """
+        try:
+            parsed = list(string.Formatter().parse(prompt))
+        except ValueError:
+            parsed = None
+        
+        if parsed is None or any(spec or conversion or (field is not None and not field.isidentifier())
+                                 for _, field, spec, conversion in parsed):
+            return lambda state: prompt.format(**state)
+        
+        def render(state):
+            return "".join([literal if field is None else literal + str(state[field])
+                            for literal, field, _, _ in parsed])
+        
+        return render
+    
     def _create_llm_node(self, node_config):
         """Create an LLM node function."""
-        def llm_node(state):
-            prompt = node_config.get("prompt", "{user_input}")
+        from langchain.schema import HumanMessage, SystemMessage
+        
+        prompt = node_config.get("prompt", "{user_input}")
+        render = self._compile_template(prompt)
+        
+        async def llm_node(state):
             # Simple template substitution
             try:
-                formatted_prompt = prompt.format(**state)
+                formatted_prompt = render(state)
             except KeyError as e:
                 logger.warning(f"Template variable missing in state: {e}")
                 formatted_prompt = prompt
@@ -277,7 +681,7 @@ class LangGraphProvider:
                 HumanMessage(content=formatted_prompt)
             ]
             
-            response = self.llm.invoke(messages)
+            response = await self.llm.ainvoke(messages)
             
             # Update state with outputs
             outputs = node_config.get("outputs", ["response"])
@@ -306,11 +710,24 @@ class LangGraphProvider:
         
         return tool_node
     
-    def _evaluate_condition(self, condition, state):
-        """Simple condition evaluation."""
+    def _compile_condition(self, edge) -> CodeType:
+        """Compile an edge condition once at build time, sharing code objects between identical conditions."""
+        condition = edge["condition"]
+        code = self._compiled_conditions.get(condition)
+        if code is None:
+            try:
+                code = compile(condition, f"<edge:{edge['from']}->{edge['to']}>", "eval")
+            except SyntaxError as e:
+                logger.error(f"Invalid condition on edge {edge['from']} -> {edge['to']}: {e}")
+                raise ValueError(f"Invalid LangGraph edge condition '{condition}': {e}")
+            self._compiled_conditions[condition] = code
+        return code
+    
+    def _evaluate_condition(self, code: CodeType, state):
+        """Simple condition evaluation against a pre-compiled condition."""
         try:
             # Very basic condition evaluation - in production use a safer evaluator
-            return eval(condition, {"__builtins__": {}}, state)
+            return eval(code, {"__builtins__": {}}, state)
         except Exception as e:
             logger.warning(f"Condition evaluation failed: {e}")
             return False
@@ -321,21 +738,22 @@ class LangGraphProvider:
             raise ValueError("LangGraph workflow not configured")
         
         # Initialize or get existing session state
-        if conversation_id not in self.sessions:
-            self.sessions[conversation_id] = {"conversation_id": conversation_id}
+        session = await self.store.get(conversation_id) or {"conversation_id": conversation_id}
         
-        state = self.sessions[conversation_id].copy()
-        state.update({"user_input": message})
+        # Layer this turn's writes over the session instead of copying it
+        turn = {"user_input": message}
+        state = ChainMap(turn, session)
         
         # Execute the workflow
         try:
-            result = self.workflow.invoke(state)
+            result = await self.workflow.ainvoke(state)
             
-            # Save updated state
-            self.sessions[conversation_id] = result
+            # Merge the turn's writes back into the session and save it
+            session.update(result.maps[0] if isinstance(result, ChainMap) else result)
+            await self.store.set(conversation_id, session)
             
             # Return the final response
-            return result.get("response", "No response generated from workflow")
+            return session.get("response", "No response generated from workflow")
         
         except Exception as e:
             logger.error(f"LangGraph workflow execution failed: {e}")
@@ -345,7 +763,7 @@ class LangGraphProvider:
 
 # Global instances
 try:
-    agent_config = AgentConfig()
+    agent_config = AgentConfig.from_env()
     
     if agent_config.framework == "direct":
         llm_provider = LLMProvider(agent_config)
@@ -362,32 +780,85 @@ except Exception as e:
     logger.critical(f"Failed to initialize agent: {e}", exc_info=True)
     raise
 
-@app.get("/health", response_model=HealthResponse)
+# Probe responses reuse a timestamp refreshed every 100ms instead of reading the clock per request
+_now_iso = datetime.now(timezone.utc).isoformat()
+
+async def _refresh_now_iso():
+    """Keeps the cached probe timestamp current."""
+    global _now_iso
+    while True:
+        _now_iso = datetime.fromtimestamp(time.time(), tz=timezone.utc).isoformat()
+        await asyncio.sleep(0.1)
+
+@app.on_event("startup")
+async def start_clock():
+    """Starts the background task behind the cached probe timestamp."""
+    app.state.clock_task = asyncio.create_task(_refresh_now_iso())
+
+@app.on_event("shutdown")
+async def close_clients():
+    """Stops the clock task and closes the HTTP clients and the session store connections."""
+    app.state.clock_task.cancel()
+    # Only the OpenAI and vLLM clients use HTTPX_CLIENT; the Claude client owns its pool
+    await HTTPX_CLIENT.aclose()
+    if llm_provider is not None:
+        await llm_provider.close()
+    if langgraph_provider is not None:
+        await langgraph_provider.store.close()
+
+# The hot endpoints return ORJSONResponse directly; the models are kept for the OpenAPI schema only
+# so FastAPI skips the jsonable_encoder + response_model revalidation round-trip.
+
+@app.get("/health", responses={200: {"model": HealthResponse}})
 async def health_check():
     """Health check endpoint for Kubernetes liveness probe."""
-    return HealthResponse(
-        status="healthy",
-        provider=agent_config.provider,
-        model=agent_config.model,
-        timestamp=datetime.now()
-    )
+    return ORJSONResponse({
+        "status": "healthy",
+        "provider": agent_config.provider,
+        "model": agent_config.model,
+        "timestamp": _now_iso
+    })
 
-@app.get("/ready", response_model=HealthResponse)
+@app.get("/ready", responses={200: {"model": HealthResponse}})
 async def readiness_check():
     """Readiness check endpoint for Kubernetes readiness probe."""
     if llm_provider.client is None:
         raise HTTPException(status_code=503, detail="LLM client not initialized")
     
-    return HealthResponse(
-        status="ready",
-        provider=agent_config.provider,
-        model=agent_config.model,
-        timestamp=datetime.now()
-    )
+    return ORJSONResponse({
+        "status": "ready",
+        "provider": agent_config.provider,
+        "model": agent_config.model,
+        "timestamp": _now_iso
+    })
+
+async def _sse_events(chunks: AsyncIterator[str]):
+    """Encodes response chunks as server-sent events, ending with a [DONE] marker."""
+    try:
+        async for chunk in chunks:
+            yield b"data: " + orjson.dumps({"delta": chunk}) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+    except Exception as e:
+        logger.error(f"Streaming chat request failed: {e}", exc_info=True)
+        yield b"event: error\ndata: " + orjson.dumps({"detail": "An internal error occurred during the chat request."}) + b"\n\n"
+
+async def _single_chunk(response_text):
+    """Wraps a complete response as a one-chunk stream, for frameworks that cannot stream."""
+    yield await response_text
 
-@app.post("/chat", response_model=ChatResponse)
+@app.post("/chat", responses={200: {"model": ChatResponse}})
 async def chat(request: ChatRequest):
-    """Main chat endpoint for interacting with the agent."""
+    """Main chat endpoint for interacting with the agent. Set stream=true to receive server-sent events."""
+    if request.stream:
+        if agent_config.framework == "direct":
+            chunks = llm_provider.stream(message=request.message, conversation_id=request.conversation_id)
+        else:
+            chunks = _single_chunk(langgraph_provider.chat(
+                message=request.message,
+                conversation_id=request.conversation_id or "single-turn"
+            ))
+        return StreamingResponse(_sse_events(chunks), media_type="text/event-stream")
+    
     try:
         if agent_config.framework == "direct":
             response_text = await llm_provider.chat(
@@ -402,13 +873,13 @@ async def chat(request: ChatRequest):
         else:
             raise HTTPException(status_code=500, detail=f"Unknown framework: {agent_config.framework}")
         
-        return ChatResponse(
-            response=response_text,
-            conversation_id=request.conversation_id or "single-turn",
-            timestamp=datetime.now(),
-            provider=agent_config.provider,
-            model=agent_config.model
-        )
+        return ORJSONResponse({
+            "response": response_text,
+            "conversation_id": request.conversation_id or "single-turn",
+            "timestamp": datetime.fromtimestamp(time.time(), tz=timezone.utc),
+            "provider": agent_config.provider,
+            "model": agent_config.model
+        })
     
     except HTTPException:
         # Re-raise HTTPException to let FastAPI handle it
@@ -417,6 +888,13 @@ async def chat(request: ChatRequest):
         logger.error(f"Chat request failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="An internal error occurred during the chat request.")
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Returns hit/miss statistics for the LLM response cache."""
+    if llm_provider is None:
+        raise HTTPException(status_code=404, detail="Response cache is only available with the direct framework")
+    return llm_provider.cache.stats()
+
 @app.get("/config")
 async def get_config():
     """Returns the current agent configuration, excluding sensitive data."""
@@ -445,6 +923,8 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=port,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
 
@@ -10,95 +10,181 @@ import os
 import json
 import time
 import random
-from typing import Dict, List
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import asyncio
+import itertools
+import logging
+import queue
+from contextlib import asynccontextmanager, contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache
+from typing import List, Optional
+import ahocorasick
+import msgspec
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import uvicorn
 from datetime import datetime
 
-app = FastAPI(title="Mock vLLM Server", version="1.0.0")
+# Optional simulated processing latency (seconds); disabled by default so tests run at full speed
+MOCK_LATENCY_MIN_S = float(os.getenv("MOCK_LATENCY_MIN_S", "0"))
+MOCK_LATENCY_JITTER_S = float(os.getenv("MOCK_LATENCY_JITTER_S", "0"))
+
+MODEL_NAME = os.getenv("MODEL_NAME", "llama2-7b-chat")
+
+# Static endpoint bodies, serialized once at import; /v1/models only splices in the created timestamp
+_MODELS_BODY_PREFIX = (
+    b'{"object":"list","data":['
+    + orjson.dumps({"id": MODEL_NAME, "object": "model", "owned_by": "mock-vllm"})[:-1]
+    + b',"created":'
+)
+_MODELS_BODY_SUFFIX = b"}]}"
+_ROOT_BODY = orjson.dumps({
+    "name": "Mock vLLM Server",
+    "version": "1.0.0",
+    "model": MODEL_NAME,
+    "status": "running",
+    "description": "Mock OpenAI-compatible API server for testing KubeAgentic"
+})
+
+# Current unix time and its ISO form, refreshed by a background task so handlers don't read the clock per request
+_NOW = [int(time.time())]
+_NOW_ISO = [datetime.now().isoformat()]
+# Per-process sequence that keeps completion ids unique within the same second;
+# the pid tag keeps ids from different workers apart
+_ID_COUNTER = itertools.count()
+_ID_PROCESS_TAG = f"{os.getpid():x}"
+
+async def _clock_updater():
+    """Refresh the cached clock every 500ms."""
+    while True:
+        _NOW[0] = int(time.time())
+        _NOW_ISO[0] = datetime.now().isoformat()
+        await asyncio.sleep(0.5)
+
+@contextmanager
+def _queued_uvicorn_logging():
+    """
+    Route uvicorn's log handlers through a queue drained by a background thread,
+    so log writes never block the event loop.
+    """
+    listeners = []
+    original_handlers = {}
+    for name in ("uvicorn", "uvicorn.access"):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            continue
+        log_queue = queue.SimpleQueue()
+        original_handlers[name] = logger.handlers
+        listeners.append(QueueListener(log_queue, *logger.handlers, respect_handler_level=True))
+        logger.handlers = [QueueHandler(log_queue)]
+    for listener in listeners:
+        listener.start()
+    try:
+        yield
+    finally:
+        for listener in listeners:
+            listener.stop()
+        for name, handlers in original_handlers.items():
+            logging.getLogger(name).handlers = handlers
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the clock updater and queued logging for the lifetime of the server."""
+    with _queued_uvicorn_logging():
+        task = asyncio.create_task(_clock_updater())
+        yield
+        task.cancel()
 
-class ChatMessage(BaseModel):
+app = FastAPI(title="Mock vLLM Server", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Request structs are immutable and never form reference cycles, so they are
+# frozen and excluded from garbage-collector tracking
+class ChatMessage(msgspec.Struct, frozen=True, gc=False):
     role: str
     content: str
 
-class ChatCompletionRequest(BaseModel):
+class ChatCompletionRequest(msgspec.Struct, frozen=True, gc=False):
+    """Only the fields the mock uses; sampling options such as temperature are ignored when decoding."""
     model: str
     messages: List[ChatMessage]
-    temperature: float = 0.7
-    max_tokens: int = 2000
-    stream: bool = False
-
-class ChatCompletionResponse(BaseModel):
-    id: str
-    object: str = "chat.completion"
-    created: int
-    model: str
-    choices: List[Dict]
-    usage: Dict[str, int]
 
 # Mock responses for different message patterns
-MOCK_RESPONSES = [
+MOCK_RESPONSES = (
     "Hello! I'm a mock LLM response. This is simulating a local vLLM server.",
     "I understand you're testing the KubeAgentic system. Everything looks good!",
     "This is a simulated response from a locally hosted language model.",
     "Mock response: I'm helping you test multi-provider AI agent deployment.",
     "Testing successful! This response comes from the mock vLLM server.",
-]
+)
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "model": os.getenv("MODEL_NAME", "llama2-7b-chat"),
-        "timestamp": datetime.now().isoformat()
-    }
+# Private, non-cryptographic PRNG for response selection and latency jitter
+_rng = random.Random()
 
-@app.get("/v1/models")
-async def list_models():
-    """List available models (OpenAI-compatible)."""
-    model_name = os.getenv("MODEL_NAME", "llama2-7b-chat")
-    return {
-        "object": "list",
-        "data": [
-            {
-                "id": model_name,
-                "object": "model",
-                "created": int(time.time()),
-                "owned_by": "mock-vllm",
-            }
-        ]
-    }
+def count_tokens(text: str) -> int:
+    """Approximate token count as the number of space-separated words, without splitting the string."""
+    return text.count(" ") + 1 if text else 0
 
-@app.post("/v1/chat/completions")
-async def create_chat_completion(request: ChatCompletionRequest):
-    """Create chat completion (OpenAI-compatible)."""
-    
-    # Simulate some processing time
-    await asyncio.sleep(0.1 + random.uniform(0, 0.3))
-    
-    # Get the user's message
-    user_message = ""
-    for msg in request.messages:
-        if msg.role == "user":
-            user_message = msg.content
-            break
-    
-    # Generate a mock response
-    mock_response = random.choice(MOCK_RESPONSES)
-    if user_message.lower() in ["hello", "hi", "hey"]:
-        mock_response = f"Hello! I received your message: '{user_message}'. This is a mock response from vLLM."
-    elif "test" in user_message.lower():
-        mock_response = f"Test confirmed! Your message was: '{user_message}'. Mock vLLM is working correctly."
-    elif "help" in user_message.lower():
-        mock_response = "I'm a mock vLLM server for testing KubeAgentic. I can simulate responses to help you test your AI agent deployment."
+# Token counts of the canned responses, computed once and indexed in parallel with MOCK_RESPONSES
+MOCK_RESPONSE_TOKENS = tuple(count_tokens(response) for response in MOCK_RESPONSES)
+
+# Keyword-triggered responses, indexed by trigger priority (lower wins)
+TRIGGER_RESPONSES = (
+    "Hello! I received your message: '{message}'. This is a mock response from vLLM.",
+    "Test confirmed! Your message was: '{message}'. Mock vLLM is working correctly.",
+    "I'm a mock vLLM server for testing KubeAgentic. I can simulate responses to help you test your AI agent deployment.",
+)
+
+# keyword -> (priority, whole_message_only); greetings only trigger when they are the entire message
+TRIGGER_KEYWORDS = {
+    "hello": (0, True),
+    "hi": (0, True),
+    "hey": (0, True),
+    "test": (1, False),
+    "help": (2, False),
+}
+
+def build_trigger_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton matching all trigger keywords in a single pass."""
+    automaton = ahocorasick.Automaton()
+    for keyword, (priority, whole_message_only) in TRIGGER_KEYWORDS.items():
+        automaton.add_word(keyword, (len(keyword), priority, whole_message_only))
+    automaton.make_automaton()
+    return automaton
+
+TRIGGER_AUTOMATON = build_trigger_automaton()
+
+def match_trigger(lower_message: str) -> Optional[int]:
+    """Return the priority of the best trigger found in a lowercased message, or None."""
+    best = None
+    for end_index, (length, priority, whole_message_only) in TRIGGER_AUTOMATON.iter(lower_message):
+        if whole_message_only and length != len(lower_message):
+            continue
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break
+    return best
+
+@lru_cache(maxsize=4096)
+def build_completion(user_message: str) -> bytes:
+    """
+    Synthesize the mock completion for a user message, pre-serialized as the JSON fields
+    '"choices":[...],"usage":{...}}' that end the response body.
+    Cached per exact message, so repeated prompts get the same response without re-running synthesis.
+    """
+    trigger = match_trigger(user_message.lower())
+    if trigger is None:
+        index = _rng.randrange(len(MOCK_RESPONSES))
+        mock_response = MOCK_RESPONSES[index]
+        completion_tokens = MOCK_RESPONSE_TOKENS[index]
+    else:
+        mock_response = TRIGGER_RESPONSES[trigger].format(message=user_message)
+        completion_tokens = count_tokens(mock_response)
+    prompt_tokens = count_tokens(user_message)
     
-    response = ChatCompletionResponse(
-        id=f"chatcmpl-mock-{int(time.time())}{random.randint(1000, 9999)}",
-        created=int(time.time()),
-        model=request.model,
-        choices=[
+    body = orjson.dumps({
+        "choices": [
             {
                 "index": 0,
                 "message": {
@@ -108,34 +194,82 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 "finish_reason": "stop"
             }
         ],
-        usage={
-            "prompt_tokens": len(user_message.split()),
-            "completion_tokens": len(mock_response.split()),
-            "total_tokens": len(user_message.split()) + len(mock_response.split())
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
         }
-    )
+    })
+    return body[1:]
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint."""
+    return {
+        "status": "healthy",
+        "model": MODEL_NAME,
+        "timestamp": _NOW_ISO[0]
+    }
+
+@app.get("/v1/models")
+async def list_models():
+    """List available models (OpenAI-compatible)."""
+    body = _MODELS_BODY_PREFIX + str(_NOW[0]).encode() + _MODELS_BODY_SUFFIX
+    return Response(content=body, media_type="application/json")
+
+_decode_chat_request = msgspec.json.Decoder(ChatCompletionRequest).decode
+
+async def create_chat_completion(http_request: Request):
+    """
+    Create chat completion (OpenAI-compatible).
+    Registered as a plain Starlette route so the body is decoded by msgspec instead of Pydantic.
+    """
+    try:
+        request = _decode_chat_request(await http_request.body())
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        return ORJSONResponse({"detail": str(e)}, status_code=422)
+    
+    # Simulate some processing time, if configured
+    if MOCK_LATENCY_MIN_S or MOCK_LATENCY_JITTER_S:
+        await asyncio.sleep(MOCK_LATENCY_MIN_S + _rng.random() * MOCK_LATENCY_JITTER_S)
     
-    return response
+    # Get the latest user message; it is normally the last message, so scan from the end
+    user_message = next((msg.content for msg in reversed(request.messages) if msg.role == "user"), "")
+    
+    # Generate a mock response and splice the per-request fields in front of the cached body
+    now = _NOW[0]
+    body = b"".join((
+        b'{"id":"chatcmpl-mock-',
+        f"{now}{_ID_PROCESS_TAG}{next(_ID_COUNTER):04x}".encode(),
+        b'","object":"chat.completion","created":',
+        str(now).encode(),
+        b',"model":',
+        orjson.dumps(request.model),
+        b",",
+        build_completion(user_message)
+    ))
+    return Response(content=body, media_type="application/json")
+
+app.add_route("/v1/chat/completions", create_chat_completion, methods=["POST"])
 
 @app.get("/")
 async def root():
     """Root endpoint with server info."""
-    return {
-        "name": "Mock vLLM Server",
-        "version": "1.0.0",
-        "model": os.getenv("MODEL_NAME", "llama2-7b-chat"),
-        "status": "running",
-        "description": "Mock OpenAI-compatible API server for testing KubeAgentic"
-    }
-
-# Add asyncio import
-import asyncio
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
+    # Each worker is a separate process that imports this module, so the automaton,
+    # response tables and clock task are built once per worker before it serves requests
+    workers = int(os.getenv("WORKERS", "1"))
     uvicorn.run(
-        app,
+        "app:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        workers=workers,
         host="0.0.0.0",
         port=port,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools",
+        access_log=False
     )